@@ -0,0 +1,56 @@
+"""Shared helpers for benchmark_frame_timing.py and benchmark_timing.py.
+
+``install_benchmarks`` copies this file next to both benchmarks, which import it
+when run with pytest or as a script by ``start_psychopy --benchmark``.
+"""
+import argparse
+import json
+
+import numpy as np
+
+try:
+    import pytest
+except ImportError:  # running as a script in a venv without pytest
+    pytest = None
+
+PERCENTILES = (50, 90, 95, 99)
+
+def summarize(durations, std_key="std_ms", histogram_bins_us=None):
+    """Count, mean, std, min, max and percentiles (ms) of durations in seconds, plus an optional µs histogram."""
+    ms = np.asarray(durations, dtype=float) * 1000
+    if ms.size == 0:
+        return {"count": 0}
+    result = {
+        "count": int(ms.size),
+        "mean_ms": float(ms.mean()),
+        std_key: float(ms.std()),
+        "min_ms": float(ms.min()),
+        "max_ms": float(ms.max()),
+    }
+    result.update({f"p{p}_ms": float(np.percentile(ms, p)) for p in PERCENTILES})
+    if histogram_bins_us is not None:
+        counts, _ = np.histogram(ms * 1000, bins=histogram_bins_us)
+        result["histogram_us"] = {
+            f"{int(low)}-{'inf' if high == float('inf') else int(high)}": int(count)
+            for low, high, count in zip(histogram_bins_us[:-1], histogram_bins_us[1:], counts)
+        }
+    return result
+
+def run_script(description, run, add_arguments=None, argv=None):
+    """Parses --output and the benchmark's own arguments, runs it and prints (and optionally writes) the JSON report.
+
+    Unknown arguments are ignored, since start_psychopy forwards all of its arguments. Returns the report.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    if add_arguments is not None:
+        add_arguments(parser)
+    args, _ = parser.parse_known_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as out:
+            out.write(text + "\n")
+    print(text)
+    return report
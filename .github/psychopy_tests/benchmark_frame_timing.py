@@ -0,0 +1,179 @@
+"""Frame timing benchmarks for an installed PsychoPy environment.
+
+Run with pytest (``python -m pytest benchmark_frame_timing.py``) or as a script
+(``python benchmark_frame_timing.py --output results.json``), which is what
+``start_psychopy --benchmark`` does. Results are percentiles in milliseconds.
+
+Works under Xvfb with a software renderer (``LIBGL_ALWAYS_SOFTWARE=1``). Xvfb has
+no vsync, so flip intervals then show the render cost instead of the refresh rate.
+"""
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+from psychopy import __version__ as psychopy_version
+from psychopy import logging, visual
+
+from benchmark_common import pytest, run_script, summarize
+
+STIM_KINDS = ("Rect", "Circle", "ImageStim", "TextStim")
+DEFAULT_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_image.png")
+
+# -------------------- Helpers --------------------
+
+def open_window():
+    logging.console.setLevel(logging.ERROR)
+    return visual.Window([800, 600], fullscr=False, units="height", waitBlanking=True)
+
+def gl_renderer():
+    try:
+        from pyglet.gl import gl_info
+        return gl_info.get_renderer()
+    except Exception:  # renderer info is optional
+        return None
+
+def grid_position(index, count):
+    side = int(np.ceil(np.sqrt(count)))
+    row, col = divmod(index, side)
+    return (-0.4 + 0.8 * col / max(side - 1, 1), -0.4 + 0.8 * row / max(side - 1, 1))
+
+def make_stim(win, kind, index, count, image):
+    pos = grid_position(index, count)
+    if kind == "Rect":
+        return visual.Rect(win, width=0.02, height=0.02, pos=pos, fillColor="red")
+    if kind == "Circle":
+        return visual.Circle(win, radius=0.01, pos=pos, fillColor="blue")
+    if kind == "ImageStim":
+        return visual.ImageStim(win, image=image, size=0.04, pos=pos)
+    return visual.TextStim(win, text=str(index), height=0.02, pos=pos)
+
+def finish_gl():
+    from pyglet import gl
+    gl.glFinish()
+
+# -------------------- Benchmarks --------------------
+
+def measure_flip_intervals(win, n_frames=300):
+    """Flip interval distribution from win.recordFrameIntervals, plus dropped frames."""
+    refresh_rate = win.getActualFrameRate(nIdentical=10, nMaxFrames=120, nWarmUpFrames=10)
+    if refresh_rate:
+        win.refreshThreshold = 1.2 / refresh_rate
+    win.frameIntervals = []
+    win.nDroppedFrames = 0
+    win.recordFrameIntervals = True
+    for _ in range(n_frames):
+        win.flip()
+    win.recordFrameIntervals = False
+
+    result = summarize(win.frameIntervals)
+    result["measured_refresh_hz"] = refresh_rate
+    result["dropped_frames"] = int(win.nDroppedFrames)
+    return result
+
+def measure_draw_throughput(win, kind, n_objects=200, n_frames=60, image=DEFAULT_IMAGE):
+    """Time to draw n_objects stimuli of one kind per frame."""
+    stims = [make_stim(win, kind, i, n_objects, image) for i in range(n_objects)]
+    draw_times = []
+    for _ in range(n_frames):
+        start = time.perf_counter()
+        for stim in stims:
+            stim.draw()
+        finish_gl()
+        draw_times.append(time.perf_counter() - start)
+        win.flip()
+
+    result = summarize(draw_times)
+    result["objects"] = n_objects
+    result["objects_per_second"] = n_objects / (result["p50_ms"] / 1000) if result["p50_ms"] else None
+    return result
+
+def measure_texture_upload(win, image=DEFAULT_IMAGE, repeats=20):
+    """Texture upload time for an image array, and decode plus upload time from the image file."""
+    pixels = np.asarray(Image.open(image).convert("RGB"), dtype=float) / 127.5 - 1
+    variants = (pixels, np.ascontiguousarray(pixels[:, ::-1]))
+    stim = visual.ImageStim(win, image=variants[1], units="pix", size=pixels.shape[1::-1])
+
+    upload_times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        stim.image = variants[i % 2]
+        stim.draw()
+        finish_gl()
+        upload_times.append(time.perf_counter() - start)
+        win.flip()
+
+    file_times = []
+    for _ in range(max(repeats // 4, 1)):
+        start = time.perf_counter()
+        visual.ImageStim(win, image=image).draw()
+        finish_gl()
+        file_times.append(time.perf_counter() - start)
+        win.flip()
+
+    return {
+        "image": os.path.basename(image),
+        "pixels": [int(pixels.shape[1]), int(pixels.shape[0])],
+        "upload": summarize(upload_times),
+        "load_from_file": summarize(file_times),
+    }
+
+def run_all(image=DEFAULT_IMAGE, n_objects=200):
+    win = open_window()
+    try:
+        return {
+            "environment": {
+                "psychopy": psychopy_version,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "gl_renderer": gl_renderer(),
+                "display": os.environ.get("DISPLAY"),
+                "software_rendering": os.environ.get("LIBGL_ALWAYS_SOFTWARE") == "1",
+            },
+            "flip_intervals": measure_flip_intervals(win),
+            "draw_throughput": {kind: measure_draw_throughput(win, kind, n_objects, image=image) for kind in STIM_KINDS},
+            "texture_upload": measure_texture_upload(win, image),
+        }
+    finally:
+        win.close()
+
+# -------------------- Pytest --------------------
+
+if pytest is not None:
+    @pytest.fixture(scope="module")
+    def win():
+        window = open_window()
+        yield window
+        window.close()
+
+    def test_flip_intervals(win):
+        result = measure_flip_intervals(win, n_frames=120)
+        assert result["count"] >= 100, f"Too few frame intervals recorded: {result}"
+        assert result["p50_ms"] > 0, f"Invalid flip intervals: {result}"
+
+    @pytest.mark.parametrize("kind", STIM_KINDS)
+    def test_draw_throughput(win, kind):
+        result = measure_draw_throughput(win, kind, n_objects=100, n_frames=20)
+        assert result["count"] == 20
+        assert result["objects_per_second"], f"No draw throughput measured for {kind}: {result}"
+
+    def test_texture_upload(win):
+        assert os.path.exists(DEFAULT_IMAGE), "Test image file not found"
+        result = measure_texture_upload(win, repeats=8)
+        assert result["upload"]["count"] == 8
+        assert result["load_from_file"]["p50_ms"] > 0
+
+# -------------------- Script --------------------
+
+def add_arguments(parser):
+    parser.add_argument("--image", default=DEFAULT_IMAGE, help="image for ImageStim and texture upload")
+    parser.add_argument("--objects", type=int, default=200, help="stimuli per kind for the draw benchmark")
+
+def main(argv=None):
+    run_script("PsychoPy frame timing benchmark", lambda args: run_all(args.image, args.objects), add_arguments, argv)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
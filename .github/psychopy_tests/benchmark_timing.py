@@ -0,0 +1,231 @@
+"""Clock precision and scheduling jitter benchmarks for an installed PsychoPy environment.
+
+Run with pytest (``python -m pytest benchmark_timing.py``) or as a script
+(``python benchmark_timing.py --output results.json``), which is what
+``start_psychopy --benchmark`` does.
+
+Measures sleep overshoot (wake-up latency) and jitter for ``time.sleep``,
+``core.wait`` and, if installed, ``psychtoolbox.WaitSecs``, at normal priority,
+at nice -20 and under SCHED_FIFO, each idle and under synthetic CPU load. It also
+reports whether the rtprio/nice/memlock limits the installer writes to
+/etc/security/limits.d/99-psychopylimits.conf are active in this session.
+"""
+import grp
+import multiprocessing
+import os
+import platform
+import pwd
+import resource
+import sys
+import time
+
+import numpy as np
+from psychopy import __version__ as psychopy_version
+from psychopy import core, logging
+
+from benchmark_common import pytest, run_script, summarize
+
+try:
+    from psychtoolbox import WaitSecs
+except ImportError:  # psychtoolbox is optional
+    WaitSecs = None
+
+HISTOGRAM_BINS_US = (0, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+EXPECTED_RTPRIO = 50
+EXPECTED_NICE = -20
+PRIORITY_MODES = ("normal", "nice", "fifo")
+
+# -------------------- Helpers --------------------
+
+def measure_overshoot(wait, duration, repeats):
+    """Overshoot of wait(duration) measured with time.perf_counter."""
+    overshoots = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        wait(duration)
+        overshoots.append(time.perf_counter() - start - duration)
+    return summarize(overshoots, std_key="jitter_std_ms", histogram_bins_us=HISTOGRAM_BINS_US)
+
+def measure_clock_resolution(samples=10000):
+    """Smallest non-zero step of core.Clock and time.perf_counter."""
+    result = {}
+    for name, read in (("core.Clock", core.Clock().getTime), ("perf_counter", time.perf_counter)):
+        values = np.array([read() for _ in range(samples)])
+        steps = np.diff(values)
+        steps = steps[steps > 0]
+        result[name] = {"resolution_us": float(steps.min() * 1e6) if steps.size else None}
+    return result
+
+def wait_methods():
+    methods = {"time.sleep": time.sleep, "core.wait": core.wait}
+    if WaitSecs is not None:
+        methods["psychtoolbox.WaitSecs"] = WaitSecs
+    return methods
+
+def _spin(stop):
+    while not stop.is_set():
+        pass
+
+class CpuLoad:
+    """Keeps every CPU busy (or the given number) with spinning processes while the context is active.
+
+    Enter it before Priority, so the spinning processes keep normal scheduling.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.stop = multiprocessing.Event()
+        self.processes = []
+
+    def __enter__(self):
+        self.processes = [multiprocessing.Process(target=_spin, args=(self.stop,), daemon=True) for _ in range(self.workers)]
+        for process in self.processes:
+            process.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+class Priority:
+    """Switches the current thread to a priority mode and restores normal scheduling afterwards."""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.error = None
+
+    def __enter__(self):
+        try:
+            if self.mode == "nice":
+                os.setpriority(os.PRIO_PROCESS, 0, EXPECTED_NICE)
+            elif self.mode == "fifo":
+                rtprio = resource.getrlimit(resource.RLIMIT_RTPRIO)[0]
+                # A limit of 0 still works for root (CAP_SYS_NICE); others get EPERM either way.
+                priority = min(EXPECTED_RTPRIO, rtprio) if 0 < rtprio < EXPECTED_RTPRIO else EXPECTED_RTPRIO
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except (PermissionError, OSError) as error:
+            self.error = str(error)
+        return self
+
+    def __exit__(self, *exc):
+        if self.mode == "fifo" and self.error is None:
+            os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+        if self.mode == "nice" and self.error is None:
+            # Raising the nice value back is always allowed.
+            os.setpriority(os.PRIO_PROCESS, 0, 0)
+
+def check_limits():
+    """Reports the rtprio/nice/memlock limits of this session and why they may be missing."""
+    user = pwd.getpwuid(os.getuid()).pw_name
+    rtprio = resource.getrlimit(resource.RLIMIT_RTPRIO)[0]
+    nice = resource.getrlimit(resource.RLIMIT_NICE)[0]
+    memlock = resource.getrlimit(resource.RLIMIT_MEMLOCK)[0]
+    unlimited = (resource.RLIM_INFINITY, -1)
+    try:
+        group = grp.getgrnam("psychopy")
+        in_group_db = user in group.gr_mem or pwd.getpwnam(user).pw_gid == group.gr_gid
+        in_group_session = group.gr_gid in os.getgroups() or os.getgid() == group.gr_gid
+    except KeyError:
+        in_group_db = in_group_session = False
+
+    limits = {
+        "user": user,
+        "rtprio": {"limit": None if rtprio in unlimited else rtprio, "ok": rtprio in unlimited or rtprio >= EXPECTED_RTPRIO},
+        # RLIMIT_NICE is 20 - lowest allowed nice value, so nice -20 needs 40.
+        "nice": {"lowest_nice": None if nice in unlimited else 20 - nice, "ok": nice in unlimited or nice >= 20 - EXPECTED_NICE},
+        "memlock": {"limit": None if memlock in unlimited else memlock, "ok": memlock in unlimited},
+        "psychopy_group_configured": in_group_db,
+        "psychopy_group_in_session": in_group_session,
+        "is_root": os.getuid() == 0,
+    }
+    limits["active"] = all(limits[key]["ok"] for key in ("rtprio", "nice", "memlock"))
+
+    if limits["active"]:
+        limits["verdict"] = "Real-time limits are active in this session."
+    elif limits["is_root"]:
+        limits["verdict"] = "Running as root, which may use real-time scheduling regardless of limits; run as a target user to check their limits."
+    elif not in_group_db:
+        limits["verdict"] = f"User '{user}' is not in the 'psychopy' group; rerun the installer with --target-users including '{user}'."
+    elif not in_group_session:
+        limits["verdict"] = f"User '{user}' was added to the 'psychopy' group after this session started; log out and back in (or reboot)."
+    else:
+        limits["verdict"] = "The 'psychopy' group is active but the limits are not; reboot (or log in again) so pam_limits applies /etc/security/limits.d/99-psychopylimits.conf."
+    return limits
+
+# -------------------- Benchmarks --------------------
+
+def run_wait_benchmarks(repeats=100):
+    return {
+        "sleep_1ms": measure_overshoot(time.sleep, 0.001, repeats * 3),
+        **{f"{name}_10ms": measure_overshoot(wait, 0.010, repeats) for name, wait in wait_methods().items()},
+    }
+
+def run_all(repeats=100):
+    logging.console.setLevel(logging.ERROR)
+    results = {}
+    for mode in PRIORITY_MODES:
+        results[mode] = {}
+        for load, workers in (("idle", 0), ("cpu_load", None)):
+            with CpuLoad(workers), Priority(mode) as priority:
+                if priority.error:
+                    results[mode][load] = {"skipped": priority.error}
+                else:
+                    results[mode][load] = run_wait_benchmarks(repeats)
+
+    return {
+        "environment": {
+            "psychopy": psychopy_version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "psychtoolbox": WaitSecs is not None,
+        },
+        "limits": check_limits(),
+        "clock_resolution": measure_clock_resolution(),
+        "wait_overshoot": results,
+    }
+
+# -------------------- Pytest --------------------
+
+if pytest is not None:
+    def test_limits_reported():
+        limits = check_limits()
+        assert limits["verdict"]
+        if os.environ.get("PSYCHOPY_EXPECT_RT_LIMITS") == "1":
+            assert limits["active"], limits["verdict"]
+
+    def test_clock_resolution():
+        result = measure_clock_resolution(samples=2000)
+        assert result["perf_counter"]["resolution_us"] is not None
+        assert result["core.Clock"]["resolution_us"] < 1000, f"core.Clock resolution too coarse: {result}"
+
+    @pytest.mark.parametrize("name", list(wait_methods()))
+    def test_wait_overshoot(name):
+        result = measure_overshoot(wait_methods()[name], 0.010, 30)
+        assert result["count"] == 30
+        assert result["min_ms"] >= -0.5, f"{name} returned early: {result}"
+        assert result["p50_ms"] < 20, f"{name} overshoot too large: {result}"
+
+    @pytest.mark.parametrize("mode", PRIORITY_MODES)
+    def test_priority_modes(mode):
+        with Priority(mode) as priority:
+            if priority.error:
+                pytest.skip(f"{mode} not permitted: {priority.error}")
+            result = measure_overshoot(time.sleep, 0.001, 50)
+        assert result["count"] == 50
+
+# -------------------- Script --------------------
+
+def add_arguments(parser):
+    parser.add_argument("--repeats", type=int, default=100, help="waits per method and condition")
+
+def main(argv=None):
+    report = run_script("PsychoPy clock and scheduling jitter benchmark", lambda args: run_all(args.repeats), add_arguments, argv)
+    print(f"Limits: {report['limits']['verdict']}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
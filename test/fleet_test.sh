@@ -0,0 +1,78 @@
+#!/bin/bash
+set -e
+
+# Tests the installer's fleet mode against local containers running sshd.
+# Usage: test/fleet_test.sh [HOSTS] [JOBS] [installer args...]
+#   HOSTS  number of containers to start (default: 3)
+#   JOBS   --fleet-jobs value (default: 2)
+
+HOST_COUNT="${1:-3}"
+FLEET_JOBS="${2:-2}"
+shift 2 2>/dev/null || shift $#
+INSTALLER_ARGS=("$@")
+[ ${#INSTALLER_ARGS[@]} -eq 0 ] && INSTALLER_ARGS=(-f --non-interactive --desktop-shortcuts=none)
+
+IMAGE="ubuntu:24.04"
+TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
+LOG_DIR="$(dirname "$0")/$(basename "$0" .sh)_logs/${TIMESTAMP}"
+INSTALLER_PATH="$(git rev-parse --show-toplevel)/psychopy_linux_installer"
+
+# Colors
+GREEN='\033[0;32m'
+BLUE='\033[0;34m'
+YELLOW='\033[1;33m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+if ! command -v docker >/dev/null 2>&1; then
+    echo -e "${RED}Docker not found. You need to enable Docker-in-Docker or use host Docker.${NC}"
+    exit 1
+fi
+
+KEY_DIR=$(mktemp -d)
+CONTAINERS=()
+
+# Removes the containers and the temporary SSH key
+cleanup() {
+    if [ ${#CONTAINERS[@]} -gt 0 ]; then
+        echo -e "${YELLOW}Cleaning up containers created by this script...${NC}"
+        sudo docker rm --force "${CONTAINERS[@]}" >/dev/null 2>&1 || true
+    fi
+    rm -rf "$KEY_DIR"
+}
+trap cleanup EXIT INT TERM
+
+ssh-keygen -q -t ed25519 -N "" -f "$KEY_DIR/id_ed25519"
+
+# Start the containers with sshd and the test key, each reachable on its own local port
+HOSTS=()
+for i in $(seq 1 "$HOST_COUNT"); do
+    name="psychopy_fleet_test_${i}_${TIMESTAMP}"
+    port=$((2221 + i))
+    echo -e "${BLUE}Starting $name on port $port...${NC}"
+    sudo docker run -d --name "$name" -p "127.0.0.1:$port:22" "$IMAGE" sleep infinity >/dev/null
+    CONTAINERS+=("$name")
+    sudo docker exec "$name" bash -c "apt-get update -qq && DEBIAN_FRONTEND=noninteractive apt-get install -y -qq openssh-server sudo >/dev/null"
+    sudo docker exec "$name" bash -c "mkdir -p /root/.ssh /run/sshd && chmod 700 /root/.ssh"
+    sudo docker cp "$KEY_DIR/id_ed25519.pub" "$name:/root/.ssh/authorized_keys"
+    sudo docker exec "$name" bash -c "chown root:root /root/.ssh/authorized_keys && chmod 600 /root/.ssh/authorized_keys && /usr/sbin/sshd"
+    HOSTS+=("root@127.0.0.1:$port")
+done
+
+# One host that cannot be reached, to check that it is reported instead of stopping the run
+HOSTS+=("root@127.0.0.1:2221")
+
+mkdir -p "$LOG_DIR"
+echo -e "${GREEN}Running fleet install on ${#HOSTS[@]} hosts, $FLEET_JOBS at a time...${NC}"
+rc=0
+FLEET_SSH_OPTIONS="-i $KEY_DIR/id_ed25519 -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o LogLevel=ERROR" \
+    bash "$INSTALLER_PATH" "--fleet-hosts=$(IFS=,; echo "${HOSTS[*]}")" "--fleet-jobs=$FLEET_JOBS" \
+    "--fleet-log-dir=$LOG_DIR" "${INSTALLER_ARGS[@]}" || rc=$?
+
+# Every container must pass and the unreachable host must be reported as such
+if [ "$(grep -c ' pass ' "$LOG_DIR/summary.txt")" -eq "$HOST_COUNT" ] && grep -q ' unreachable ' "$LOG_DIR/summary.txt"; then
+    echo -e "${GREEN}Fleet test passed (installer exit code $rc, expected 1 for the unreachable host). Logs: $LOG_DIR${NC}"
+else
+    echo -e "${RED}Fleet test failed. See $LOG_DIR/summary.txt${NC}"
+    exit 1
+fi